@@ -1,13 +1,18 @@
-import streamlit as st
-from googleapiclient.discovery import build
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
-import google.generativeai as genai
+import json
+import queue
+import random
 import re
+import threading
 import time
-import random
-from fpdf import FPDF
-import io
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+import streamlit as st
+from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, RequestBlocked
+
+# googleapiclient, google.generativeai and fpdf are slow to import, so they
+# are imported inside the functions that need them. That moves their import
+# cost off the first page load (later reruns find them in sys.modules anyway).
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -19,73 +24,140 @@ st.set_page_config(
 # --- 1. CORE HELPER FUNCTIONS (Your YouTube Code) ---
 # (We don't need dotenv or os here, Streamlit handles secrets)
 
+# Compiled once at import; clean_transcript_basic runs for every transcript
+# Only whitespace that actually needs changing: runs of 2+, or a lone tab/newline/etc.
+# A plain single space is left alone, so already-clean text isn't rewritten.
+_WS_RE = re.compile(r'\s{2,}|[^\S ]')
+_LONE_I_RE = re.compile(r'\bi\s+', re.IGNORECASE)
+_SPACE_BEFORE_PUNCT_RE = re.compile(r'\s+([,.!?])')
+_PUNCT_NO_SPACE_RE = re.compile(r'([,.!?])(\w)')
+
+_CONTRACTIONS = {
+    'im': "I'm", 'id': "I'd", 'ive': "I've",
+    'youre': "you're", 'youve': "you've",
+    'hes': "he's", 'shes': "she's", 'its': "it's",
+    'theyre': "they're", 'theyve': "they've",
+    'weve': "we've", 'were': "we're",
+    'dont': "don't", 'wont': "won't", 'cant': "can't",
+    'isnt': "isn't", 'wasnt': "wasn't", 'arent': "aren't",
+    'didnt': "didn't", 'doesnt': "doesn't", 'havent': "haven't",
+    'hasnt': "hasn't", 'hadnt': "hadn't",
+    'wouldnt': "wouldn't", 'shouldnt': "shouldn't", 'couldnt': "couldn't",
+    'thats': "that's", 'whats': "what's", 'wheres': "where's",
+}
+_CONTRACTION_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _CONTRACTIONS)) + r')\b', re.IGNORECASE)
+
+# Marks snippet boundaries so a whole transcript can be cleaned in one pass.
+# NUL is neither whitespace nor a word character, so no cleaning rule eats it.
+_SNIPPET_SEP = '\x00'
+_SNIPPET_SEP_RE = re.compile(r'\s*\x00\s*')
+
 def clean_transcript_basic(text):
     """
     Simple text cleaning: normalizes whitespace and fixes contractions.
     """
-    text = re.sub(r'\s+', ' ', text).strip()
-    contractions = {
-        r'\bi\s+': 'I ', r'\bim\b': "I'm", r'\bid\b': "I'd", r'\bive\b': "I've",
-        r'\byoure\b': "you're", r'\byouve\b': "you've",
-        r'\bhes\b': "he's", r'\bshes\b': "she's", r'\bits\b': "it's",
-        r'\btheyre\b': "they're", r'\btheyve\b': "they've",
-        r'\bweve\b': "we've", r'\bwere\b': "we're",
-        r'\bdont\b': "don't", r'\bwont\b': "won't", r'\bcant\b': "can't",
-        r'\bisnt\b': "isn't", r'\bwasnt\b': "wasn't", r'\barent\b': "aren't",
-        r'\bdidnt\b': "didn't", r'\bdoesnt\b': "doesn't", r'\bhavent\b': "haven't",
-        r'\bhasnt\b': "hasn't", r'\bhadnt\b': "hadn't",
-        r'\bwouldnt\b': "wouldn't", r'\bshouldnt\b': "shouldn't", r'\bcouldnt\b': "couldn't",
-        r'\bthats\b': "that's", r'\bwhats\b': "what's", r'\bwheres\b': "where's",
-    }
-    for pattern, replacement in contractions.items():
-        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-    text = re.sub(r'\s+([,.!?])', r'\1', text)
-    text = re.sub(r'([,.!?])(\w)', r'\1 \2', text)
+    text = _WS_RE.sub(' ', text).strip()
+    text = _LONE_I_RE.sub('I ', text)
+    text = _CONTRACTION_RE.sub(lambda m: _CONTRACTIONS[m.group(1).lower()], text)
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
+    text = _PUNCT_NO_SPACE_RE.sub(r'\1 \2', text)
     return text
 
+@st.cache_resource
+def _youtube_client(api_key):
+    """
+    Builds the YouTube Data API client once per process; loading the
+    discovery document is the slow part. httplib2 isn't thread-safe, so
+    callers pass their own Http to execute() instead of sharing the default.
+    """
+    from googleapiclient.discovery import build
+    return build('youtube', 'v3', developerKey=api_key, cache_discovery=False)
+
+@st.cache_resource
+def _transcript_api():
+    """
+    One YouTubeTranscriptApi per process, so its requests.Session (and its
+    open connections to YouTube) is reused across fetches and reruns.
+    """
+    return YouTubeTranscriptApi()
+
 # MODIFIED: Renamed to get_channel_videos and max_results is now 25
 @st.cache_data(show_spinner="Searching for channel videos...")
 def get_channel_videos(api_key, channel_name, max_results=25):
     """
     Get latest video IDs from a YouTube channel by channel name.
-    WARNING: This costs 100 quota units per search.
+    Resolves "@handle" or a legacy username first (1 quota unit each).
+    WARNING: Falling back to search costs 100 quota units.
     """
     try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        
-        # 1. Search for the channel (Cost: 100 units)
-        search_response = youtube.search().list(
-            q=channel_name,
-            type='channel',
-            part='id,snippet',
-            maxResults=1
-        ).execute()
-        
-        if not search_response['items']:
-            st.error(f"Channel '{channel_name}' not found")
-            return []
+        from googleapiclient.http import build_http
+        youtube = _youtube_client(api_key)
+        http = build_http() # Kept alive for all the calls in this search
+        channel_name = channel_name.strip()
+        uploads_fields = 'items(contentDetails/relatedPlaylists/uploads)'
         
-        channel_id = search_response['items'][0]['id']['channelId']
+        # 1. Resolve the channel directly by handle or username (Cost: 1 unit each)
+        lookups = []
+        if channel_name.startswith('@'):
+            lookups.append({'forHandle': channel_name})
+        elif ' ' not in channel_name:
+            lookups.append({'forUsername': channel_name})
+            lookups.append({'forHandle': channel_name})
         
-        # 2. Get channel details for uploads playlist (Cost: 1 unit)
-        channel_response = youtube.channels().list(
-            id=channel_id,
-            part='contentDetails'
-        ).execute()
-        uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        uploads_playlist_id = None
+        for lookup in lookups:
+            channel_response = youtube.channels().list(
+                part='contentDetails',
+                fields=uploads_fields,
+                **lookup
+            ).execute(http=http)
+            if channel_response.get('items'):
+                uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+                break
         
-        # 3. Get videos from the uploads playlist (Cost: 1 unit)
-        playlist_response = youtube.playlistItems().list(
-            playlistId=uploads_playlist_id,
-            part='snippet',
-            maxResults=max_results
-        ).execute()
+        # 2. Otherwise search for the channel (Cost: 100 units + 1 unit for details)
+        if uploads_playlist_id is None:
+            search_response = youtube.search().list(
+                q=channel_name,
+                type='channel',
+                part='id',
+                fields='items(id/channelId)',
+                maxResults=1
+            ).execute(http=http)
+            
+            if not search_response.get('items'):
+                st.error(f"Channel '{channel_name}' not found")
+                return []
+            
+            channel_id = search_response['items'][0]['id']['channelId']
+            
+            channel_response = youtube.channels().list(
+                id=channel_id,
+                part='contentDetails',
+                fields=uploads_fields
+            ).execute(http=http)
+            uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
         
+        # 3. Get videos from the uploads playlist (Cost: 1 unit per 50 videos)
         video_data = []
-        for item in playlist_response['items']:
-            video_id = item['snippet']['resourceId']['videoId']
-            video_title = item['snippet']['title']
-            video_data.append({'video_id': video_id, 'title': video_title})
+        page_token = None
+        while len(video_data) < max_results:
+            playlist_response = youtube.playlistItems().list(
+                playlistId=uploads_playlist_id,
+                part='snippet',
+                fields='nextPageToken,items/snippet(resourceId/videoId,title)',
+                maxResults=min(50, max_results - len(video_data)), # API caps a page at 50
+                pageToken=page_token
+            ).execute(http=http)
+            
+            for item in playlist_response.get('items', []):
+                video_id = item['snippet']['resourceId']['videoId']
+                video_title = item['snippet']['title']
+                video_data.append({'video_id': video_id, 'title': video_title})
+            
+            page_token = playlist_response.get('nextPageToken')
+            if not page_token:
+                break
         
         return video_data
     
@@ -93,30 +165,108 @@ def get_channel_videos(api_key, channel_name, max_results=25):
         st.error(f"Error accessing YouTube API: {e}")
         return []
 
+# Paces transcript requests from all worker threads to ~5 per second,
+# so the thread pool can't hammer YouTube into blocking us
+_FETCH_INTERVAL = 0.2
+
+@st.cache_resource
+def _fetch_pacer():
+    """
+    Returns the (lock, state) shared by every session and rerun in this
+    process. Module globals would be rebuilt on each rerun, so overlapping
+    runs would not be paced together.
+    """
+    return threading.Lock(), {"next_fetch_time": 0.0}
+
+def _wait_for_fetch_slot():
+    """
+    Blocks until this thread may send its next transcript request.
+    """
+    lock, state = _fetch_pacer()
+    with lock:
+        now = time.monotonic()
+        slot = max(now, state["next_fetch_time"])
+        state["next_fetch_time"] = slot + _FETCH_INTERVAL
+    time.sleep(slot - now)
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _fetch_transcript(video_id, _yt_api):
+    """
+    Fetch one transcript as a flat list of snippet texts (all the app
+    uses). Transcripts don't change, so they are cached on disk by
+    video_id alone and survive server restarts.
+    (_yt_api is left out of the cache key by its leading underscore.)
+    """
+    _wait_for_fetch_slot() # Only reached on a cache miss
+    return [snippet.text for snippet in _yt_api.fetch(video_id)]
+
+def _fetch_one(yt_api, video_id, video_title, max_retries=3):
+    """
+    Fetch a single transcript. Runs in a worker thread, so it must not touch
+    Streamlit; any exception is returned instead of raised.
+    Backs off with jitter only when YouTube starts blocking requests.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return video_id, video_title, _fetch_transcript(video_id, yt_api)
+        except RequestBlocked as e:
+            if attempt == max_retries:
+                return video_id, video_title, e
+            time.sleep(random.uniform(1, min(30, 2 ** (attempt + 1))))
+        except Exception as e:
+            return video_id, video_title, e
+
 # MODIFIED: Takes a list of video_ids, returns a dictionary
-@st.cache_data(show_spinner="Fetching transcripts...")
 def get_transcripts_for_videos(video_ids_to_fetch):
     """
     Get transcripts for a list of selected video IDs.
+    Fetches run concurrently; progress is shown in one progress bar and
+    one collapsible status box, updated from the main thread.
+    Caching happens per video in _fetch_transcript, not per selection.
     """
+    total = len(video_ids_to_fetch)
+    bar = st.progress(0, text=f"Fetching {total} transcript(s)...")
+    status = st.status("Transcripts", expanded=False)
+    
+    # One client for every fetch, so its HTTP session (and open connections
+    # to YouTube) is shared by all the worker threads
+    yt_api = _transcript_api()
     transcripts = {}
-    for video_id, video_title in video_ids_to_fetch:
-        try:
-            yt_api = YouTubeTranscriptApi()
-            transcript_list = yt_api.fetch(video_id)
+    executor = ThreadPoolExecutor(max_workers=8)
+    try:
+        futures = [
+            executor.submit(_fetch_one, yt_api, video_id, video_title)
+            for video_id, video_title in video_ids_to_fetch
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            video_id, video_title, result = future.result()
+            if isinstance(result, TranscriptsDisabled):
+                status.write(f"⚠️ Transcripts are disabled for: {video_title}")
+            elif isinstance(result, NoTranscriptFound):
+                status.write(f"⚠️ No transcript found for: {video_title}")
+            elif isinstance(result, Exception):
+                status.write(f"❌ Error fetching transcript for {video_title}: {result}")
+            else:
+                status.write(f"✅ Got transcript for: {video_title}")
+            bar.progress(done / total, text=f"Fetched {done} of {total} transcript(s)")
+    finally:
+        # If the user interrupts the run, Streamlit raises out of the loop
+        # above; drop the queued fetches instead of waiting for them
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    # Keep the selection order, not the order fetches finished in
+    for future in futures:
+        video_id, video_title, result = future.result()
+        if not isinstance(result, Exception):
             transcripts[video_id] = {
                 'title': video_title,
-                'transcript_list': transcript_list
+                'texts': result
             }
-            st.success(f"Got transcript for: {video_title}")
-        except TranscriptsDisabled:
-            st.warning(f"Transcripts are disabled for: {video_title}")
-        except NoTranscriptFound:
-            st.warning(f"No transcript found for: {video_title}")
-        except Exception as e:
-            st.error(f"Error fetching transcript for {video_title}: {e}")
-        time.sleep(1) # Small delay
     
+    status.update(
+        label=f"Got {len(transcripts)} of {total} transcript(s)",
+        state="complete" if len(transcripts) == total else "error"
+    )
     return transcripts
 
 # --- 2. CORE HELPER FUNCTIONS (Your Gemini Code) ---
@@ -124,31 +274,100 @@ def get_transcripts_for_videos(video_ids_to_fetch):
 # This function combines both your Gemini scripts
 # --- 2. CORE HELPER FUNCTIONS (Your Gemini Code) ---
 
+@st.cache_resource
+def _get_model():
+    """
+    Imports and configures google.generativeai and builds the model handle
+    once per process; every call, worker thread and rerun shares it.
+    (functools.lru_cache would not do: Streamlit re-executes this file on
+    every rerun, so each run would get a fresh, empty cache.)
+    """
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_KEY)
+    return genai.GenerativeModel("models/gemini-pro-latest")
+
+@st.cache_data(show_spinner=False, ttl=7 * 24 * 3600, max_entries=128)
+def _generate_content(full_prompt, response_mime_type=None, _on_chunk=None):
+    """
+    Calls Gemini and caches the reply by prompt, so re-running the same
+    video and format skips the API. Raises on failure so errors are
+    never cached.
+    The reply is streamed; each piece of text is passed to _on_chunk as it
+    arrives (the leading underscore keeps it out of the cache key).
+    """
+    model = _get_model()
+    
+    # --- THIS IS THE FIX ---
+    # Set a high output token limit to ensure it processes the
+    # entire transcript and doesn't just stop at the intro.
+    # 65536 is the real ceiling for Gemini Pro; larger values are
+    # rejected or silently clamped.
+    gen_config = {
+        "max_output_tokens": 65536
+    }
+    if response_mime_type:
+        gen_config["response_mime_type"] = response_mime_type
+    
+    response = model.generate_content(
+        full_prompt,
+        generation_config=gen_config, # Pass the config here
+        stream=True
+    )
+    # --- END OF FIX ---
+    
+    chunks = []
+    finish_reason = None
+    for chunk in response:
+        # Only the final chunk carries a reason; the rest report 0 (unspecified)
+        if chunk.candidates and chunk.candidates[0].finish_reason:
+            finish_reason = chunk.candidates[0].finish_reason
+        if not chunk.parts:
+            continue
+        chunks.append(chunk.text)
+        if _on_chunk is not None:
+            _on_chunk(chunk.text)
+    
+    # A blocked (safety, recitation...) or empty reply must raise, not be
+    # cached as if it were the formatted transcript
+    reason = getattr(finish_reason, "name", finish_reason)
+    if not chunks or reason not in (None, "STOP", "MAX_TOKENS"):
+        raise ValueError(f"Gemini returned no usable text (finish reason: {reason})")
+    return "".join(chunks)
+
+# Gemini Pro's free tier allows 5 requests per minute, so that many run at
+# once and rate-limit (429) replies are retried with backoff
+GEMINI_MAX_WORKERS = 5
+GEMINI_MAX_RETRIES = 3
+
+def _generate_with_retry(full_prompt, response_mime_type=None, on_chunk=None):
+    """
+    Calls _generate_content, retrying on ResourceExhausted (HTTP 429)
+    with exponential backoff and +/-25% jitter.
+    Before a retry, on_chunk is called with None so anything streamed by
+    the failed attempt can be discarded.
+    """
+    from google.api_core.exceptions import ResourceExhausted
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        if attempt and on_chunk is not None:
+            on_chunk(None)
+        try:
+            return _generate_content(full_prompt, response_mime_type, _on_chunk=on_chunk)
+        except ResourceExhausted:
+            if attempt == GEMINI_MAX_RETRIES:
+                raise
+            time.sleep(4 * 2 ** attempt * random.uniform(0.75, 1.25))
+
 # This function combines both your Gemini scripts
-def run_gemini_model(transcript_text, system_prompt, gemini_api_key):
+def run_gemini_model(transcript_text, system_prompt, on_chunk=None):
     """
     A single function to run a Gemini model with a specific system prompt.
-    *** MODIFIED: Added generation_config to set a higher output limit. ***
+    Safe to call from worker threads; the model is shared per process.
+    on_chunk, if given, is called with each piece of the streamed reply.
     """
     try:
-        genai.configure(api_key=gemini_api_key)
-        model = genai.GenerativeModel("models/gemini-pro-latest")
-        full_prompt = f"{system_prompt}\n\nHere is the text:\n---\n{transcript_text}\n---"
-        
-        # --- THIS IS THE FIX ---
-        # Set a high output token limit to ensure it processes the
-        # entire transcript and doesn't just stop at the intro.
-        gen_config = {
-            "max_output_tokens": 9999999
-        }
-        
-        response = model.generate_content(
-            full_prompt,
-            generation_config=gen_config # Pass the config here
-        )
-        # --- END OF FIX ---
-        
-        return response.text
+        prefix, _ = _prompt_frames(system_prompt)
+        full_prompt = "".join((prefix, transcript_text, _PROMPT_SUFFIX))
+        return _generate_with_retry(full_prompt, on_chunk=on_chunk)
     except Exception as e:
         return f"Error calling Gemini: {e}"
 
@@ -175,54 +394,160 @@ Keep it neat, readable, and funny. Use slang in a way that feels real, not force
 
 EXPLAINER_PROMPT = "make detailed points out of this, do not skip details and in the end give all learnings and resources in a clear set of actionables->"
 
+# Short transcripts are sent to Gemini together so the (long) system prompt
+# is paid once per batch. Replies are about as long as the input, so the
+# budget is kept well under the model's output limit.
+BATCH_TOKEN_BUDGET = 5000 # Estimated as len(text) // 4
+BATCH_MAX_VIDEOS = 5
+
+BATCH_INSTRUCTIONS = """You will receive a JSON array of videos, each with an "id", a "title" and a "text".
+Apply the instructions above to each video's text separately.
+Return only a JSON array with one object per video: {"id": <the same id>, "result": "<your output for that video>"}."""
+
+# The text wrapped around transcripts: a (single-video, batch) prefix pair
+# per system prompt, built once at import for the app's two prompts
+_PROMPT_SUFFIX = "\n---"
+
+def _build_prompt_frames(system_prompt):
+    return (
+        f"{system_prompt}\n\nHere is the text:\n---\n",
+        f"{system_prompt}\n\n{BATCH_INSTRUCTIONS}\n\nHere are the videos:\n---\n",
+    )
+
+_PROMPT_FRAMES = {
+    prompt: _build_prompt_frames(prompt)
+    for prompt in (BRAINROT_PROMPT, EXPLAINER_PROMPT)
+}
+
+def _prompt_frames(system_prompt):
+    """
+    Returns the (single-video, batch) prefixes for a system prompt.
+    """
+    frames = _PROMPT_FRAMES.get(system_prompt)
+    if frames is None:
+        frames = _build_prompt_frames(system_prompt)
+    return frames
+
+def group_jobs_into_batches(jobs):
+    """
+    Groups (title, text) jobs into lists of job indices whose estimated
+    token count fits BATCH_TOKEN_BUDGET. Long transcripts get a batch
+    of their own.
+    """
+    batches = []
+    current, current_tokens = [], 0
+    for i, (title, text) in enumerate(jobs):
+        tokens = len(text) // 4
+        if current and (current_tokens + tokens > BATCH_TOKEN_BUDGET or len(current) == BATCH_MAX_VIDEOS):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+def run_gemini_batch(items, system_prompt, on_chunk=None):
+    """
+    Formats several (title, text) transcripts with one Gemini request and
+    returns the results in the same order. Any video missing from the
+    reply (or all of them, if it isn't valid JSON) falls back to its own
+    request; an API error is returned for every video instead.
+    Only single-video batches stream to on_chunk; a batched reply is JSON.
+    """
+    if len(items) == 1:
+        return [run_gemini_model(items[0][1], system_prompt, on_chunk)]
+    
+    videos = [{"id": i, "title": title, "text": text} for i, (title, text) in enumerate(items, start=1)]
+    _, prefix = _prompt_frames(system_prompt)
+    full_prompt = "".join((prefix, json.dumps(videos, ensure_ascii=False), _PROMPT_SUFFIX))
+    try:
+        raw_reply = _generate_with_retry(full_prompt, "application/json")
+    except Exception as e:
+        # Quota or API errors would hit every per-video retry too, so
+        # report them for the whole batch instead of falling back
+        return [f"Error calling Gemini: {e}"] * len(items)
+    try:
+        reply = json.loads(raw_reply)
+    except json.JSONDecodeError:
+        reply = []
+    if not isinstance(reply, list):
+        reply = []
+    
+    results = {}
+    for entry in reply:
+        if not isinstance(entry, dict) or not isinstance(entry.get("result"), str):
+            continue
+        # JSON mode doesn't stop the model echoing the id as "1" instead of 1
+        try:
+            results[int(entry["id"])] = entry["result"]
+        except (KeyError, TypeError, ValueError):
+            continue
+    
+    return [
+        results[i] if i in results else run_gemini_model(text, system_prompt)
+        for i, (title, text) in enumerate(items, start=1)
+    ]
+
 
 # --- 3. FORMATTING AND PDF FUNCTIONS ---
 
 # --- 3. FORMATTING AND PDF FUNCTIONS ---
 
-def format_original_transcript(transcript_list):
+@st.cache_data(show_spinner=False, max_entries=128)
+def format_original_transcript(texts):
     """
-    Takes the raw transcript list and formats it into
-    4-snippet paragraphs.
+    Takes the list of snippet texts and formats it into
+    4-snippet paragraphs. Cached, so re-submitting the same
+    videos skips the cleaning pass.
     """
-    cleaned_snippets = []
-    for snippet in transcript_list:
-        # --- FIXED: Use dot notation (snippet.text) instead of brackets ---
-        cleaned_text = clean_transcript_basic(snippet.text)
-        cleaned_snippets.append(cleaned_text)
-    
-    paragraphs = []
-    chunk_size = 4 
-    for i in range(0, len(cleaned_snippets), chunk_size):
-        chunk = cleaned_snippets[i:i + chunk_size]
-        paragraphs.append(' '.join(chunk))
+    # Clean all snippets in a single pass, then split them back apart
+    joined = f' {_SNIPPET_SEP} '.join(texts)
+    cleaned_snippets = _SNIPPET_SEP_RE.split(clean_transcript_basic(joined))
     
+    chunk_size = 4
+    paragraphs = [
+        ' '.join(cleaned_snippets[i:i + chunk_size])
+        for i in range(0, len(cleaned_snippets), chunk_size)
+    ]
     return '\n\n'.join(paragraphs)
 
 # This is the PDF generation function
-class PDF(FPDF):
-    def header(self):
-        self.set_font('DejaVu', 'B', 12) # Use DejaVu for UTF-8
-        self.cell(0, 10, 'Transcribrr 🚀', 0, 1, 'C')
+@st.cache_resource
+def _pdf_class():
+    """
+    Builds the PDF class on first use, so fpdf is only imported
+    when a PDF is actually generated. Held in st.cache_resource so
+    it is built once per process, not once per rerun.
+    """
+    from fpdf import FPDF
 
-    def chapter_title(self, title):
-        self.set_font('DejaVu', 'B', 14)
-        self.cell(0, 10, title, 0, 1, 'L')
-        self.ln(5)
+    class PDF(FPDF):
+        def header(self):
+            self.set_font('DejaVu', 'B', 12) # Use DejaVu for UTF-8
+            self.cell(0, 10, 'Transcribrr 🚀', 0, 1, 'C')
 
-    def chapter_body(self, text):
-        self.set_font('DejaVu', '', 10)
-        self.multi_cell(0, 5, text)
-        self.ln()
+        def chapter_title(self, title):
+            self.set_font('DejaVu', 'B', 14)
+            self.cell(0, 10, title, 0, 1, 'L')
+            self.ln(5)
+
+        def chapter_body(self, text):
+            self.set_font('DejaVu', '', 10)
+            self.multi_cell(0, 5, text)
+            self.ln()
+
+    return PDF
 
 def create_pdf_from_transcripts(processed_transcripts):
     """
     Takes a list of (title, text) tuples and generates a PDF in memory.
     """
-    pdf = PDF()
+    pdf = _pdf_class()()
     # Add fonts - Make sure the .ttf files are in the same folder
-    pdf.add_font('DejaVu', '', 'DejaVuSans.ttf', uni=True)
-    pdf.add_font('DejaVu', 'B', 'DejaVuSans-Bold.ttf', uni=True)
+    # (fpdf2 always treats TTFs as Unicode and embeds only the glyphs used)
+    pdf.add_font('DejaVu', '', 'DejaVuSans.ttf')
+    pdf.add_font('DejaVu', 'B', 'DejaVuSans-Bold.ttf')
     
     for title, text in processed_transcripts:
         pdf.add_page()
@@ -230,8 +555,34 @@ def create_pdf_from_transcripts(processed_transcripts):
         pdf.chapter_body(text)
         
     # --- FIXED: Explicitly convert the bytearray output to bytes ---
-    # This is what st.download_button expects.
-    return bytes(pdf.output(dest='S'))
+    # This is what st.download_button expects. fpdf2 returns the bytearray
+    # directly; the deprecated dest='S' argument is not needed.
+    return bytes(pdf.output())
+
+def show_streamed_chunks(stream_queue, previews, jobs):
+    """
+    Renders streamed Gemini text queued by worker threads (which can't
+    touch Streamlit themselves). previews maps a job index to its
+    (placeholder, chunks) pair and is created on the first chunk.
+    A None chunk means the request is being retried, so the preview
+    starts over.
+    """
+    while True:
+        try:
+            i, text = stream_queue.get_nowait()
+        except queue.Empty:
+            return
+        if text is None:
+            if i in previews:
+                placeholder, chunks = previews[i]
+                chunks.clear()
+                placeholder.empty()
+            continue
+        if i not in previews:
+            previews[i] = (st.expander(jobs[i][0], expanded=True).empty(), [])
+        placeholder, chunks = previews[i]
+        chunks.append(text)
+        placeholder.markdown("".join(chunks))
 
 # --- 4. THE STREAMLIT APP UI ---
 
@@ -261,7 +612,7 @@ if 'final_pdf_data' not in st.session_state:
 
 # --- STEP 1: Channel Search ---
 st.header("Step 1: Find a Channel")
-channel_name = st.text_input("Enter YouTube Channel Name", placeholder="e.g., MrBeast or TechWithTim")
+channel_name = st.text_input("Enter YouTube Channel Name", placeholder="e.g., @MrBeast or TechWithTim")
 
 if st.button("Search Channel"):
     st.session_state.video_list = [] # Clear old results
@@ -317,30 +668,68 @@ if st.session_state.video_list:
             with st.spinner("Processing... This might take a few minutes for multiple videos and AI..."):
                 
                 # 1. Fetch transcripts
-                raw_transcripts = get_transcripts_for_videos(selected_videos)
-                
-                processed_transcripts = [] # List to hold (title, final_text)
+                # Re-submitting the same selection reuses this session's copy,
+                # skipping the disk cache's unpickling. Only complete fetches are
+                # kept, so a retry still refetches any video that failed.
+                selection_key = tuple(video_id for video_id, _ in selected_videos)
+                if st.session_state.get('raw_transcripts_key') == selection_key:
+                    raw_transcripts = st.session_state.raw_transcripts
+                else:
+                    raw_transcripts = get_transcripts_for_videos(selected_videos)
+                    if len(raw_transcripts) == len(selected_videos):
+                        st.session_state.raw_transcripts = raw_transcripts
+                        st.session_state.raw_transcripts_key = selection_key
                 
+                # 2. Format as "Original" first
+                jobs = [] # List to hold (title, original_text)
                 for video_id, data in raw_transcripts.items():
-                    # 2. Format as "Original" first
-                    original_formatted_text = format_original_transcript(data['transcript_list'])
-                    
-                    final_text = ""
-                    title = f"Video: {data['title']}"
-                    
-                    # 3. Apply AI format if chosen
-                    if format_option == "Original Transcript":
-                        final_text = original_formatted_text
-                    
-                    elif format_option == "Brainrot Transcript (Gen Z)":
-                        st.text(f"Running 'Brainrot' model on: {data['title']}...")
-                        final_text = run_gemini_model(original_formatted_text, BRAINROT_PROMPT, GEMINI_KEY)
-                    
-                    elif format_option == "AI Explainer (Detailed Notes)":
-                        st.text(f"Running 'AI Explainer' model on: {data['title']}...")
-                        final_text = run_gemini_model(original_formatted_text, EXPLAINER_PROMPT, GEMINI_KEY)
-                    
-                    processed_transcripts.append((title, final_text))
+                    original_formatted_text = format_original_transcript(data['texts'])
+                    jobs.append((f"Video: {data['title']}", original_formatted_text))
+                
+                # 3. Apply AI format if chosen
+                system_prompt = None
+                if format_option == "Brainrot Transcript (Gen Z)":
+                    system_prompt = BRAINROT_PROMPT
+                elif format_option == "AI Explainer (Detailed Notes)":
+                    system_prompt = EXPLAINER_PROMPT
+                
+                if system_prompt is None or not jobs:
+                    processed_transcripts = jobs # List to hold (title, final_text)
+                else:
+                    # Gemini calls are network-bound, so send short transcripts
+                    # together in batches and run a few batches at once.
+                    # Single-video replies are streamed to the page as they arrive.
+                    processed_transcripts = [None] * len(jobs)
+                    progress = st.progress(0, text=f"Running '{format_option}' model on {len(jobs)} video(s)...")
+                    stream_queue = queue.Queue()
+                    previews = {}
+                    batches = group_jobs_into_batches(jobs)
+                    executor = ThreadPoolExecutor(max_workers=min(GEMINI_MAX_WORKERS, len(batches)))
+                    try:
+                        futures = {}
+                        for batch in batches:
+                            on_chunk = None
+                            if len(batch) == 1:
+                                on_chunk = lambda text, i=batch[0]: stream_queue.put((i, text))
+                            future = executor.submit(run_gemini_batch, [jobs[i] for i in batch], system_prompt, on_chunk)
+                            futures[future] = batch
+                        
+                        done = 0
+                        pending = set(futures)
+                        while pending:
+                            finished, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                            show_streamed_chunks(stream_queue, previews, jobs)
+                            for future in finished:
+                                batch = futures[future]
+                                for i, result in zip(batch, future.result()):
+                                    processed_transcripts[i] = (jobs[i][0], result)
+                                done += len(batch)
+                                progress.progress(done / len(jobs), text=f"Finished {done} of {len(jobs)} video(s)")
+                    finally:
+                        # A click mid-run makes Streamlit raise out of the loop above;
+                        # cancel the queued batches so an abandoned run stops spending
+                        # Gemini quota (only batches already running finish)
+                        executor.shutdown(wait=False, cancel_futures=True)
                 
                 # 4. Generate PDF
                 if processed_transcripts:
@@ -1,8 +1,48 @@
-import markdown
+from markdown_it import MarkdownIt
 from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
 import re  # Used for fixing the text
 import os  # Used for file paths
 
+# --- Compiled once at import for clean_and_fix_text ---
+
+# Single-character fixes done in one str.translate pass:
+# drop the BOM (seen at "word-of-mouth") and turn Unicode bullets (•) into Markdown asterisks (*)
+_TRANSLATE_TABLE = str.maketrans({'\ufeff': None, '•': '*'})
+
+_RE_TRANSCRIBRR = re.compile(r'\s*Transcribrr\s*')
+
+# All the "turn this line into a header" rules in one alternation.
+# A line can only match one of them, so a single pass is equivalent.
+_RE_HEADER = re.compile(
+    r'^(?P<part>Part \d+:.*?)$'
+    r'|^(?P<learn>Learnings and Actionable Takeaways)$'
+    r'|^(?P<alpha>[A-Z]\..*?)$',
+    re.MULTILINE
+)
+
+# Run-on numbered (" 2. ") and bulleted (" * ") list items. Kept as two
+# passes: the patterns share their surrounding spaces (" * 1. "), so a
+# single alternation would split such runs differently.
+_RE_NUM_LIST = re.compile(r'( \d+\. )')
+_RE_BULLET_LIST = re.compile(r'( \* )')
+
+_RE_JUMBLED = re.compile(r'(\S) (\d+\.)')
+_RE_NEWLINES = re.compile(r'\n\n+')
+
+def _header_replacement(match):
+    """
+    Picks the Markdown header for whichever _RE_HEADER branch matched.
+    """
+    if match.group('part'):
+        # "Part 1: ..." lines become sub-headers
+        return f"### {match.group('part')}"
+    if match.group('learn'):
+        # The "Learnings..." line becomes a major header
+        return f"\n---\n## {match.group('learn')}"
+    # "A. Core Philosophy..." lines become sub-headers
+    return f"### {match.group('alpha')}"
+
 def clean_and_fix_text(text_input):
     """
     Cleans and fixes the broken formatting of the input text
@@ -10,81 +50,56 @@ def clean_and_fix_text(text_input):
     """
     print("Cleaning and fixing text...")
     
-    # Remove BOM character (seen at "word-of-mouth")
-    cleaned_text = text_input.replace('\ufeff', '')
+    # Remove the BOM and standardize bullets in one pass
+    cleaned_text = text_input.translate(_TRANSLATE_TABLE)
     
     # Remove "Transcribrr" artifacts
-    cleaned_text = re.sub(r'\s*Transcribrr\s*', '\n', cleaned_text).strip()
+    cleaned_text = _RE_TRANSCRIBRR.sub('\n', cleaned_text).strip()
     
     # --- Fix Major Sections ---
     
-    # Convert "Part 1: ..." lines into Markdown headers
-    cleaned_text = re.sub(r'^(Part \d+:.*?)$', r'### \1', cleaned_text, flags=re.MULTILINE)
-    
-    # Convert "Learnings..." line into a major header
-    cleaned_text = re.sub(r'^(Learnings and Actionable Takeaways)$', r'\n---\n## \1', cleaned_text, flags=re.MULTILINE)
-    
-    # Convert "A. Core Philosophy..." lines into sub-headers
-    cleaned_text = re.sub(r'^([A-Z]\..*?)$', r'### \1', cleaned_text, flags=re.MULTILINE)
+    # Convert "Part 1: ...", "Learnings..." and "A. Core Philosophy..."
+    # lines into Markdown headers in one pass
+    cleaned_text = _RE_HEADER.sub(_header_replacement, cleaned_text)
 
     # --- Fix Broken Lists ---
     
-    # Standardize Unicode bullets (•) to Markdown asterisks (*)
-    cleaned_text = cleaned_text.replace('•', '*')
-    
     # Fix run-on numbered lists (e.g., "1. Inbound... 2. Outbound...")
-    cleaned_text = re.sub(r'( \d+\. )', r'\n\1', cleaned_text)
+    cleaned_text = _RE_NUM_LIST.sub(r'\n\1', cleaned_text)
     
     # Fix run-on bulleted lists (e.g., "machine. * 1. Foundational...")
-    cleaned_text = re.sub(r'( \* )', r'\n\1', cleaned_text)
+    cleaned_text = _RE_BULLET_LIST.sub(r'\n\1', cleaned_text)
     
     # Fix jumbled lists in the "Learnings" section (e.g., "Funnel: 2. Create...")
-    cleaned_text = re.sub(r'(\S) (\d+\.)', r'\1\n\2', cleaned_text)
+    cleaned_text = _RE_JUMBLED.sub(r'\1\n\2', cleaned_text)
     
     # Clean up any potential double newlines created by the fixes
-    cleaned_text = re.sub(r'\n\n+', '\n\n', cleaned_text)
+    cleaned_text = _RE_NEWLINES.sub('\n\n', cleaned_text)
     
     return cleaned_text.strip()
 
 
-def create_fancy_pdf(text_input, output_filename="professional_summary.pdf"):
-    """
-    Cleans, converts, and styles text/markdown into a 'fancy' PDF.
-    """
-    
-    # --- 1. Clean the Text ---
-    cleaned_text = clean_and_fix_text(text_input)
-    
-    # Extract the title and main content
-    lines = cleaned_text.split('\n', 1)
-    title_line = lines[0].replace("Video: ", "").strip()
-    main_content = lines[1] if len(lines) > 1 else ""
-    
-    # --- 2. Convert Markdown to HTML ---
-    print("Converting Markdown to HTML...")
-    html_body = markdown.markdown(main_content)
-    
-    html_doc = f"""
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <title>{title_line}</title>
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;700&family=Merriweather:wght@400;700&display=swap" rel="stylesheet">
-    </head>
-    <body>
-        <div class="content">
-            <h1>{title_line}</h1>
-            {html_body}
-        </div>
-    </body>
-    </html>
-    """
-    
-    # --- 3. Define the "Fancy" CSS Styling ---
-    
-    css_style = """
-    /* Use @font-face to import fonts for WeasyPrint */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;700&family=Merriweather:wght@400;700&display=swap');
+# Strict CommonMark covers everything the cleaned text uses (headers, lists,
+# bold, ---); raw HTML and images are switched off
+_MD = MarkdownIt("commonmark").disable(['html_block', 'html_inline', 'image'])
+
+# --- "Fancy" CSS Styling ---
+
+FANCY_PDF_CSS = """
+    /* Use @font-face with the fonts bundled next to this file, so
+       rendering never waits on a network fetch (Inter/Merriweather
+       are still used if they are installed locally) */
+    @font-face {
+        font-family: 'DejaVu Sans';
+        src: url('DejaVuSans.ttf');
+        font-weight: 400;
+    }
+
+    @font-face {
+        font-family: 'DejaVu Sans';
+        src: url('DejaVuSans-Bold.ttf');
+        font-weight: 700;
+    }
 
     @page {
         size: A4;
@@ -93,7 +108,7 @@ def create_fancy_pdf(text_input, output_filename="professional_summary.pdf"):
     }
     
     body {
-        font-family: 'Inter', 'Helvetica', 'Arial', sans-serif;
+        font-family: 'Inter', 'DejaVu Sans', 'Helvetica', 'Arial', sans-serif;
         line-height: 1.7;
         font-size: 11pt;
         color: #343a40; /* Dark gray text for readability */
@@ -129,7 +144,7 @@ def create_fancy_pdf(text_input, output_filename="professional_summary.pdf"):
     
     /* Style for ### (Part 1:, A., B., etc.) */
     h3 { 
-        font-family: 'Inter', 'Helvetica', sans-serif;
+        font-family: 'Inter', 'DejaVu Sans', 'Helvetica', sans-serif;
         font-weight: 700; /* Bold */
         font-size: 15pt;
         color: #007bff; /* Bright Blue Accent */
@@ -167,19 +182,54 @@ def create_fancy_pdf(text_input, output_filename="professional_summary.pdf"):
         margin-bottom: 40px;
     }
     """
+
+# Parsed once at import, so every PDF reuses the same stylesheet and font
+# setup. base_url lets the @font-face rules find the bundled .ttf files.
+_BASE_URL = os.path.dirname(os.path.abspath(__file__))
+_FONT_CONFIG = FontConfiguration()
+_WEASY_CSS = CSS(string=FANCY_PDF_CSS, base_url=_BASE_URL, font_config=_FONT_CONFIG)
+
+
+def create_fancy_pdf(text_input, output_filename="professional_summary.pdf"):
+    """
+    Cleans, converts, and styles text/markdown into a 'fancy' PDF.
+    """
+    
+    # --- 1. Clean the Text ---
+    cleaned_text = clean_and_fix_text(text_input)
+    
+    # Extract the title and main content
+    lines = cleaned_text.split('\n', 1)
+    title_line = lines[0].replace("Video: ", "").strip()
+    main_content = lines[1] if len(lines) > 1 else ""
+    
+    # --- 2. Convert Markdown to HTML ---
+    print("Converting Markdown to HTML...")
+    html_body = _MD.render(main_content)
+    
+    html_doc = f"""
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <title>{title_line}</title>
+    </head>
+    <body>
+        <div class="content">
+            <h1>{title_line}</h1>
+            {html_body}
+        </div>
+    </body>
+    </html>
+    """
     
-    # --- 4. Render the PDF ---
+    # --- 3. Render the PDF ---
     print(f"Rendering PDF: {output_filename}...")
     
     try:
-        # Use a dummy base_url to help resolve paths if any
-        base_url = os.path.dirname(os.path.abspath(__file__))
-        
-        html = HTML(string=html_doc, base_url=base_url)
-        css = CSS(string=css_style)
+        html = HTML(string=html_doc, base_url=_BASE_URL)
         
-        # Write the PDF
-        html.write_pdf(output_filename, stylesheets=[css])
+        # Write the PDF (the font config is needed for the @font-face rules)
+        html.write_pdf(output_filename, stylesheets=[_WEASY_CSS], font_config=_FONT_CONFIG)
         
         print(f"\n✅ Success! PDF saved as '{output_filename}'")
         
@@ -206,4 +256,4 @@ if __name__ == "__main__":
         print(f"❌ ERROR: The file '{input_file}' was not found.")
         print("Please create 'input.txt' in the same directory and paste your text into it.")
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")d
\ No newline at end of file
+        print(f"An unexpected error occurred: {e}")